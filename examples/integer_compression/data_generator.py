@@ -1,41 +1,121 @@
-import gzip
+import hashlib
+import os
+import urllib.error
 import urllib.request
+import zlib
 from pathlib import Path
 
+# Source: https://github.com/vteromero/integer-compression-benchmarks
+# URL to the compressed data file
+_TS_URL = "https://github.com/zentures/encoding/raw/b90e310a0325f9b765b4be7220df3642ad93ad8d/benchmark/data/ts.txt.gz"
+
+# Read the compressed stream in 256 KiB chunks; block size directly affects
+# decompression throughput and the payload is never fully held in memory.
+_READ_BUFFER_SIZE = 256 * 1024
+
+# Target directories already verified in this process, so repeated calls
+# skip the filesystem checks entirely.
+_downloaded: set[str] = set()
+
+
+def _sidecar_path(ts_file: Path) -> Path:
+    return ts_file.with_name(ts_file.name + ".sha256")
+
+
+def _etag_path(ts_file: Path) -> Path:
+    return ts_file.with_name(ts_file.name + ".etag")
+
+
+def _revalidate(etag: str) -> bool:
+    """Check whether the server still serves the version identified by etag.
+
+    A 304 response means the cached copy is current and nothing was
+    downloaded; any other outcome requires a fresh download.
+    """
+    request = urllib.request.Request(_TS_URL, headers={"If-None-Match": etag})
+    try:
+        with urllib.request.urlopen(request):
+            return False
+    except urllib.error.HTTPError as e:
+        return e.code == 304
+    except urllib.error.URLError:
+        return False
+
 
 def download_ts_data(target_dir: Path) -> None:
     """Download and extract ts.txt data file if it doesn't exist"""
+    cache_key = str(target_dir)
+    if cache_key in _downloaded:
+        return
+
     target_dir.mkdir(parents=True, exist_ok=True)
 
     ts_file = target_dir / "ts.txt"
+    sidecar = _sidecar_path(ts_file)
+    etag_file = _etag_path(ts_file)
 
-    # Check if file already exists (cache)
+    # Check if file already exists (cache). The sidecar is written only after
+    # the data file has been atomically moved into place, so its presence
+    # guarantees the cached file is complete.
     if ts_file.exists():
-        return
+        if sidecar.exists():
+            _downloaded.add(cache_key)
+            return
+
+        # No sidecar, so the file's provenance is unknown. If we have the
+        # ETag of a previous download, a conditional request can confirm the
+        # copy is still current with a zero-byte 304 instead of a re-download.
+        if etag_file.exists():
+            if _revalidate(etag_file.read_text().strip()):
+                digest = hashlib.sha256(ts_file.read_bytes()).hexdigest()
+                sidecar.write_text(digest)
+                _downloaded.add(cache_key)
+                return
+            # The server reports a newer version; fall through to re-download
+        else:
+            # A bare ts.txt predates the sidecar scheme (it was always
+            # trusted before); adopt it and record its digest instead of
+            # discarding a multi-MB download
+            digest = hashlib.sha256(ts_file.read_bytes()).hexdigest()
+            sidecar.write_text(digest)
+            _downloaded.add(cache_key)
+            return
 
     print("Downloading ts.txt.gz from zentures/encoding repository...")
 
-    # Source: https://github.com/vteromero/integer-compression-benchmarks
-    # URL to the compressed data file
-    url = "https://github.com/zentures/encoding/raw/b90e310a0325f9b765b4be7220df3642ad93ad8d/benchmark/data/ts.txt.gz"
+    tmp_file = ts_file.with_name(ts_file.name + ".tmp")
 
     try:
-        # Download the gzipped file
-        with urllib.request.urlopen(url) as response:
-            compressed_data = response.read()
-
         print("Extracting ts.txt...")
 
-        # Decompress the data
-        decompressed_data = gzip.decompress(compressed_data)
+        # Stream-decompress straight to disk instead of decompressing the
+        # whole payload in memory, hashing the decompressed bytes as we go.
+        # wbits=31 makes zlib accept the gzip header/trailer.
+        digest = hashlib.sha256()
+        decompressor = zlib.decompressobj(wbits=31)
+        with urllib.request.urlopen(_TS_URL) as response:
+            etag = response.headers.get("ETag")
+            with open(tmp_file, "wb") as out:
+                while chunk := response.read(_READ_BUFFER_SIZE):
+                    data = decompressor.decompress(chunk)
+                    digest.update(data)
+                    out.write(data)
+
+                data = decompressor.flush()
+                digest.update(data)
+                out.write(data)
 
-        # Write to ts.txt
-        with open(ts_file, "wb") as f:
-            f.write(decompressed_data)
+        # Atomic rename so a crash mid-download can't leave a partial ts.txt.
+        os.replace(tmp_file, ts_file)
+        sidecar.write_text(digest.hexdigest())
+        if etag is not None:
+            etag_file.write_text(etag)
 
+        _downloaded.add(cache_key)
         print(f"Successfully downloaded and extracted ts.txt to {ts_file}")
 
     except Exception as e:
+        tmp_file.unlink(missing_ok=True)
         print(f"Error downloading or extracting ts.txt: {e}")
         raise
 
@@ -1,9 +1,9 @@
 import unittest
 import ast
-from examples.tsp.evaluator import NestedFunctionDetector
+from examples.tsp.evaluator import has_nested_functions
 
 
-class TestNestedFunctionDetector(unittest.TestCase):
+class TestHasNestedFunctions(unittest.TestCase):
     def test_has_nested_functions(self):
         code = """
 def outer_function():
@@ -12,9 +12,7 @@ def outer_function():
     return inner_function()
 """
         tree = ast.parse(code)
-        detector = NestedFunctionDetector()
-        detector.visit(tree)
-        self.assertTrue(detector.has_nested)
+        self.assertTrue(has_nested_functions(tree))
 
     def test_no_nested_functions(self):
         code = """
@@ -29,9 +27,17 @@ def standalone_function():
     return "not nested"
 """
         tree = ast.parse(code)
-        detector = NestedFunctionDetector()
-        detector.visit(tree)
-        self.assertFalse(detector.has_nested)
+        self.assertFalse(has_nested_functions(tree))
+
+    def test_async_nested_function(self):
+        code = """
+async def outer_function():
+    async def inner_function():
+        return "nested"
+    return await inner_function()
+"""
+        tree = ast.parse(code)
+        self.assertTrue(has_nested_functions(tree))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-import copy
+import time
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Tuple
 
@@ -9,6 +9,19 @@ class Context:
         self._end_time = end_time
         self._best_solution: Optional[List[int]] = None
 
+        # Translate the wall-clock deadline into a monotonic one so time
+        # checks in hot loops are a single clock read instead of a
+        # timezone-aware datetime construction
+        self._deadline_monotonic = (
+            time.monotonic()
+            + (end_time - datetime.now(tz=timezone.utc)).total_seconds()
+        )
+
+        # Structure-of-arrays view of the coordinates: two flat tuples that
+        # index as plain floats, avoiding a tuple unpack per access
+        self._xs: Tuple[float, ...] = tuple(p[0] for p in instance)
+        self._ys: Tuple[float, ...] = tuple(p[1] for p in instance)
+
     @property
     def best_solution(self) -> Optional[List[int]]:
         return self._best_solution
@@ -22,17 +35,31 @@ class Context:
         """
         return self._instance
 
+    @property
+    def xs(self) -> Tuple[float, ...]:
+        """X coordinates of all cities, indexed by city."""
+        return self._xs
+
+    @property
+    def ys(self) -> Tuple[float, ...]:
+        """Y coordinates of all cities, indexed by city."""
+        return self._ys
+
+    def remaining_seconds(self) -> float:
+        """
+        Returns:
+            The remaining time available for computation in seconds, never
+            negative. Cheaper than remaining_time() in tight loops.
+        """
+        remaining = self._deadline_monotonic - time.monotonic()
+        return remaining if remaining > 0.0 else 0.0
+
     def remaining_time(self) -> timedelta:
         """
         Returns:
             The remaining time available for computation as a timedelta object.
         """
-        now = datetime.now(tz=timezone.utc)
-        remaining = self._end_time - now
-        if remaining < timedelta():
-            remaining = timedelta()
-
-        return remaining
+        return timedelta(seconds=self.remaining_seconds())
 
     def report_new_best_solution(self, solution: List[int]) -> None:
         """
@@ -47,7 +74,9 @@ class Context:
             - The last reported solution before time expires will be taken as the final answer.
             - Solutions reported after the time runs out will be ignored.
         """
-        if self.remaining_time() <= timedelta():
+        if self.remaining_seconds() <= 0.0:
             return
 
-        self._best_solution = copy.copy(solution)
+        # A plain slice copies the list without going through the copy
+        # module's type dispatch; this runs on every reported improvement
+        self._best_solution = solution[:]
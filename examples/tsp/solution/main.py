@@ -1,3 +1,4 @@
+import json
 import math
 from datetime import datetime, timedelta, timezone
 import os
@@ -7,51 +8,13 @@ from context import Context
 from solver import solve
 
 
-def parse_coordinate_line(line: str) -> Tuple[float, float]:
-    """Parse a coordinate line and extract x, y coordinates.
-
-    Args:
-        line: A line like "1 981036 508139"
-
-    Returns:
-        Tuple of (x, y) coordinates as floats
-    """
-    parts = line.strip().split()
-    if len(parts) < 3:
-        raise ValueError(f"Invalid coordinate line: {line}")
-
-    # Extract x and y coordinates (ignoring node_id)
-    x = float(parts[1])
-    y = float(parts[2])
-
-    return (x, y)
-
-
-def parse_coordinates_section(lines: List[str]) -> List[Tuple[float, float]]:
-    """Parse all coordinate lines from the NODE_COORD_SECTION.
-
-    Args:
-        lines: List of lines from the coordinates section
-
-    Returns:
-        List of (x, y) coordinate tuples
-    """
-    coordinates: List[Tuple[float, float]] = []
-
-    for line in lines:
-        line = line.strip()
-        if not line or line == "EOF":
-            break
-
-        coord = parse_coordinate_line(line)
-        coordinates.append(coord)
-
-    return coordinates
-
-
 def parse_tsplib_file(filepath: Path) -> List[Tuple[float, float]]:
     """Parse a TSPLIB file and extract coordinates.
 
+    The file is read whole and walked in a single pass: lines before
+    NODE_COORD_SECTION are skipped, then each "id x y" line contributes one
+    coordinate until EOF or a blank line.
+
     Args:
         filepath: Path to the TSPLIB file
 
@@ -62,22 +25,25 @@ def parse_tsplib_file(filepath: Path) -> List[Tuple[float, float]]:
         FileNotFoundError: If the file doesn't exist
         ValueError: If the file format is invalid
     """
-    with open(filepath, "r") as file:
-        lines = file.readlines()
-
-    # Find the NODE_COORD_SECTION
-    coord_section_start = None
-    for i, line in enumerate(lines):
-        if line.strip() == "NODE_COORD_SECTION":
-            coord_section_start = i + 1
+    coordinates: List[Tuple[float, float]] = []
+    in_section = False
+
+    for line in filepath.read_text().splitlines():
+        line = line.strip()
+        if not in_section:
+            in_section = line == "NODE_COORD_SECTION"
+            continue
+        if not line or line == "EOF":
             break
 
-    if coord_section_start is None:
-        raise ValueError("NODE_COORD_SECTION not found in file")
+        parts = line.split()
+        if len(parts) < 3:
+            raise ValueError(f"Invalid coordinate line: {line}")
+        # Extract x and y coordinates (ignoring node_id)
+        coordinates.append((float(parts[1]), float(parts[2])))
 
-    # Parse coordinates from the section
-    coord_lines = lines[coord_section_start:]
-    coordinates = parse_coordinates_section(coord_lines)
+    if not in_section:
+        raise ValueError("NODE_COORD_SECTION not found in file")
 
     if not coordinates:
         raise ValueError("No valid coordinates found in file")
@@ -85,6 +51,19 @@ def parse_tsplib_file(filepath: Path) -> List[Tuple[float, float]]:
     return coordinates
 
 
+def load_instance(directory: Path) -> List[Tuple[float, float]]:
+    """Load the instance, preferring a pre-parsed instance.json if present.
+
+    The evaluator writes instance.json alongside this script so runner
+    subprocesses skip the line-by-line TSPLIB parsing.
+    """
+    cached = directory / "instance.json"
+    if cached.exists():
+        return [(point[0], point[1]) for point in json.loads(cached.read_text())]
+
+    return parse_tsplib_file(directory / "a280.tsp")
+
+
 def calculate_euclidean_distance(
     point1: Tuple[float, float], point2: Tuple[float, float]
 ) -> float:
@@ -97,14 +76,12 @@ def calculate_euclidean_distance(
     Returns:
         Euclidean distance between the two points
     """
-    x1, y1 = point1
-    x2, y2 = point2
-    return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    return math.dist(point1, point2)
 
 
 def calculate_tour_distance(
     solution: List[int], instance: List[Tuple[float, float]]
-) -> float:
+) -> int:
     # Check that every city appears exactly once
     solution_set = set(solution)
     expected_set = set(range(len(instance)))
@@ -119,34 +96,42 @@ def calculate_tour_distance(
     if missing_cities:
         raise ValueError(f"Solution is missing cities: {missing_cities}")
 
-    total_distance = 0.0
-
-    # Create pairs of consecutive cities, including wraparound from last to first
-    for i in range(len(solution)):
-        city1 = solution[i]
-        city2 = solution[(i + 1) % len(solution)]
-        total_distance += calculate_euclidean_distance(instance[city1], instance[city2])
+    # Walk consecutive city pairs, starting from the wraparound edge so no
+    # per-step modulo is needed; math.dist runs the arithmetic in C. Each
+    # edge is rounded to the nearest integer per the TSPLIB EUC_2D
+    # convention, so scores are comparable with published optima.
+    dist = math.dist
+    total_distance = 0
+    previous = instance[solution[-1]]
+    for city in solution:
+        point = instance[city]
+        total_distance += int(dist(previous, point) + 0.5)
+        previous = point
 
     return total_distance
 
 
 def main():
     timeout_seconds = int(os.getenv("TIMEOUT_SECONDS", "30"))
+    num_runs = int(os.getenv("NUM_RUNS", "1"))
 
-    instance = parse_tsplib_file(Path(__file__).parent / "a280.tsp")
+    instance = load_instance(Path(__file__).parent)
 
-    now = datetime.now(tz=timezone.utc)
-    end_time = now + timedelta(seconds=timeout_seconds)
+    # Run the solver num_runs times in one process so the interpreter and
+    # import startup cost is paid once, emitting one >>> line per run
+    for _ in range(num_runs):
+        now = datetime.now(tz=timezone.utc)
+        end_time = now + timedelta(seconds=timeout_seconds)
 
-    context = Context(instance=instance, end_time=end_time)
-    solve(context)
+        context = Context(instance=instance, end_time=end_time)
+        solve(context)
 
-    # Calculate and output the tour distance
-    if context.best_solution is None:
-        raise Exception("No solution found")
+        # Calculate and output the tour distance
+        if context.best_solution is None:
+            raise Exception("No solution found")
 
-    tour_distance = calculate_tour_distance(context.best_solution, instance)
-    print(f">>> {tour_distance}")
+        tour_distance = calculate_tour_distance(context.best_solution, instance)
+        print(f">>> {tour_distance}", flush=True)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,10 @@
+import hashlib
+import os
+import pickle
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, Optional, Union
 
 
@@ -14,3 +19,63 @@ class Evaluator(ABC):
     @abstractmethod
     def evaluate(self, code: str) -> EvaluatorResult:
         pass
+
+
+class EvaluationCache:
+    """
+    Cache of evaluation results keyed by a content hash of the code.
+
+    Entries are kept in a bounded in-memory LRU and persisted to
+    ~/.cache/optiverse/eval/{name} so repeated submissions of the same
+    solution skip the evaluation entirely, including across runs.
+    """
+
+    def __init__(self, name: str, max_memory_entries: int = 128):
+        self._directory = Path.home() / ".cache" / "optiverse" / "eval" / name
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._memory: OrderedDict[str, EvaluatorResult] = OrderedDict()
+        self._max_memory_entries = max_memory_entries
+
+    def _key(self, code: str) -> str:
+        return hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+
+    def _remember(self, key: str, result: EvaluatorResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, code: str) -> Optional[EvaluatorResult]:
+        key = self._key(code)
+
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            return result
+
+        result_file = self._directory / f"{key}.pkl"
+        if not result_file.exists():
+            return None
+
+        try:
+            with open(result_file, "rb") as f:
+                loaded = pickle.load(f)
+        except Exception:
+            return None
+
+        if not isinstance(loaded, EvaluatorResult):
+            return None
+
+        self._remember(key, loaded)
+        return loaded
+
+    def put(self, code: str, result: EvaluatorResult) -> None:
+        key = self._key(code)
+        self._remember(key, result)
+
+        # Atomic rename so a crash mid-write can't leave a partial entry
+        result_file = self._directory / f"{key}.pkl"
+        tmp_file = result_file.with_suffix(".pkl.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(result, f)
+        os.replace(tmp_file, result_file)
@@ -1,9 +1,10 @@
+import functools
 import logging
-import re
 from dataclasses import dataclass
 from typing import List, Optional
 from openai.types.chat import ChatCompletionMessageParam
 from .config import LLMConfig
+from .prompt_generator import Prompt
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +13,14 @@ logger = logging.getLogger(__name__)
 class SolutionResponse:
     code: str
     description: Optional[str]
+    # Token accounting reported by the provider, when available. Tracking
+    # cached_tokens confirms the static prompt prefix is actually hitting
+    # the provider-side prompt cache.
+    prompt_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
 
 
-def create_system_prompt() -> str:
-    return """You are an expert software developer. Follow the response format exactly as specified - no more, no less.
+_SYSTEM_PROMPT = """You are an expert software developer. Follow the response format exactly as specified - no more, no less.
 
 Your response must include only the following two parts, in this order:
 
@@ -33,75 +38,162 @@ Solution code
 ```"""
 
 
-class LLMClient:
-    def __init__(self, llm_config: LLMConfig):
-        self._llm_config = llm_config
+def create_system_prompt() -> str:
+    return _SYSTEM_PROMPT
 
-    def generate(self, prompt: str) -> SolutionResponse:
-        system_prompt = create_system_prompt()
 
-        messages: List[ChatCompletionMessageParam] = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt},
-        ]
+class _ResponseScanner:
+    """Incremental parser for streamed LLM responses.
 
-        logger.debug("=" * 60)
-        logger.debug("=== LLM INPUT ===")
-        logger.debug("=" * 60)
-        logger.debug("System prompt:")
-        logger.debug(system_prompt)
-        logger.debug("User prompt:")
-        logger.debug(prompt)
-        logger.debug("=" * 60)
+    Locates the first fenced code block in a single pass as chunks
+    arrive, instead of buffering the whole response and re-scanning it
+    afterwards. A backtick run split across chunk boundaries is held
+    back between feeds so fences are still detected; chunks after the
+    closing fence are discarded."""
 
-        completion_stream = self._llm_config.client.chat.completions.create(
-            model=self._llm_config.model,
-            messages=messages,
-            stream=True,
-        )
+    def __init__(self) -> None:
+        self._description_parts: List[str] = []
+        self._code_parts: List[str] = []
+        self._pending: str = ""
+        self._in_code = False
+        self._done = False
 
-        response_buffer: List[str] = []
+    def feed(self, chunk: str) -> None:
+        if self._done:
+            return
 
-        for chunk in completion_stream:
-            content = chunk.choices[0].delta.content
-            if content is not None:
-                response_buffer.append(content)
+        text = self._pending + chunk
+        self._pending = ""
 
-        response_content = "".join(response_buffer)
+        while text:
+            fence = text.find("```")
 
-        # Debug log: LLM output
-        logger.debug("=" * 60)
-        logger.debug("=== LLM OUTPUT ===")
-        logger.debug("=" * 60)
-        logger.debug("Response received from LLM:")
-        logger.debug(response_content)
-        logger.debug("=" * 60)
+            if fence == -1:
+                # Hold back up to two trailing backticks in case the
+                # fence continues in the next chunk
+                cut = len(text)
+                while cut > 0 and len(text) - cut < 2 and text[cut - 1] == "`":
+                    cut -= 1
+                if cut > 0:
+                    self._current_buffer().append(text[:cut])
+                self._pending = text[cut:]
+                return
+
+            if fence > 0:
+                self._current_buffer().append(text[:fence])
 
-        return self._parse_response(response_content)
+            if self._in_code:
+                self._done = True
+                return
 
-    def _parse_response(self, response_content: str) -> SolutionResponse:
-        # Parse the response to extract explanation and code
-        # Look for the first ``` to separate explanation from code
-        code_blocks = re.findall(r"```(.*?)```", response_content, re.DOTALL)
+            self._in_code = True
+            text = text[fence + 3 :]
 
-        if not code_blocks:
+    def _current_buffer(self) -> List[str]:
+        return self._code_parts if self._in_code else self._description_parts
+
+    def result(self) -> SolutionResponse:
+        if not self._done:
             logger.info("No code blocks found in LLM response")
             return SolutionResponse(code="", description=None)
 
-        # Get the first code block and remove any text before the first newline
-        raw_content = code_blocks[0]
+        # Remove any text before the first newline (e.g. a language tag)
+        raw_content = "".join(self._code_parts)
         first_newline = raw_content.find("\n")
         if first_newline != -1:
             file_content = raw_content[first_newline + 1 :].strip()
         else:
             file_content = raw_content.strip()
 
-        # Extract description (everything before the first ```)
-        description = None
-        first_code_block_start = response_content.find("```")
-        if first_code_block_start > 0:
-            description_text = response_content[:first_code_block_start].strip()
-            if description_text:
-                description = description_text
+        # Description is everything before the opening fence
+        description = "".join(self._description_parts).strip() or None
 
         return SolutionResponse(code=file_content, description=description)
+
+
+@functools.lru_cache(maxsize=8)
+def _full_system_prompt(static: str) -> str:
+    """Combined response instructions and static prompt part.
+
+    Memoized because the static part is identical across iterations, so
+    the concatenation is built once per distinct problem."""
+    return f"{_SYSTEM_PROMPT}\n\n{static}"
+
+
+class LLMClient:
+    def __init__(self, llm_config: LLMConfig):
+        self._llm_config = llm_config
+
+    def generate(self, prompt: Prompt) -> SolutionResponse:
+        # The system message and the static prompt part are identical from
+        # one iteration to the next; keeping them ahead of the dynamic part
+        # forms a stable prefix that provider-side prompt caches can reuse
+        system_prompt = _full_system_prompt(prompt.static)
+
+        messages: List[ChatCompletionMessageParam] = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt.dynamic},
+        ]
+
+        # Guarded so the multi-KB prompt strings never reach the logging
+        # machinery when DEBUG is disabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=" * 60)
+            logger.debug("=== LLM INPUT ===")
+            logger.debug("=" * 60)
+            logger.debug("System prompt:")
+            logger.debug("%s", system_prompt)
+            logger.debug("User prompt:")
+            logger.debug("%s", prompt.dynamic)
+            logger.debug("=" * 60)
+
+        completion_stream = self._llm_config.client.chat.completions.create(
+            model=self._llm_config.model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        scanner = _ResponseScanner()
+        # The full response is only kept around for debug logging
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        response_buffer: List[str] = []
+        usage = None
+
+        for chunk in completion_stream:
+            # With include_usage, the final chunk carries usage and no choices
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content is not None:
+                    scanner.feed(content)
+                    if debug_enabled:
+                        response_buffer.append(content)
+            if chunk.usage is not None:
+                usage = chunk.usage
+
+        prompt_tokens: Optional[int] = None
+        cached_tokens: Optional[int] = None
+        if usage is not None:
+            prompt_tokens = usage.prompt_tokens
+            details = usage.prompt_tokens_details
+            cached_tokens = (details.cached_tokens or 0) if details is not None else 0
+            logger.info(
+                "Prompt tokens: %d, cached: %d (%.0f%%)",
+                prompt_tokens,
+                cached_tokens,
+                100 * cached_tokens / max(1, prompt_tokens),
+            )
+
+        # Debug log: LLM output
+        if debug_enabled:
+            logger.debug("=" * 60)
+            logger.debug("=== LLM OUTPUT ===")
+            logger.debug("=" * 60)
+            logger.debug("Response received from LLM:")
+            logger.debug("%s", "".join(response_buffer))
+            logger.debug("=" * 60)
+
+        response = scanner.result()
+        response.prompt_tokens = prompt_tokens
+        response.cached_tokens = cached_tokens
+        return response
@@ -1,8 +1,9 @@
 import json
 import logging
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, Optional
 
 from .search_strategies import SearchContext
 from .prompt_generator import DefaultPromptGenerator, PromptGeneratorContext
@@ -68,13 +69,21 @@ class Optimizer:
             enhanced_tags[f"parent_id_{i}"] = solution_with_title.solution.id
             enhanced_tags[f"parent_title_{i}"] = solution_with_title.title
 
+        # Record token usage alongside the evaluator metrics so prompt-cache
+        # hit rates can be tracked across a run
+        enhanced_metrics = result.metrics.copy()
+        if solution_response.prompt_tokens is not None:
+            enhanced_metrics["prompt_tokens"] = solution_response.prompt_tokens
+        if solution_response.cached_tokens is not None:
+            enhanced_metrics["cached_tokens"] = solution_response.cached_tokens
+
         solution_id = self._store.add_solution(
             artifacts=result.artifacts,
             code=file_content,
             description=description,
             is_initial=False,
-            metrics=result.metrics,
-            prompt=prompt,
+            metrics=enhanced_metrics,
+            prompt=prompt.text,
             score=result.score,
             tags=enhanced_tags,
         )
@@ -189,11 +198,9 @@ class Optimizer:
         valid_solutions = [s for s in all_solutions if s.score is not None]
 
         if valid_solutions:
-            # Sort by score (best first) and get the top solution
-            sorted_solutions = sorted(
-                valid_solutions, key=lambda x: cast(float, x.score)
-            )
-            best_solution = sorted_solutions[0]
+            # Only the single best solution is needed, so a min() pass
+            # avoids sorting the whole list
+            best_solution = min(valid_solutions, key=attrgetter("score"))
             logger.info(f"ID: {best_solution.id}")
             logger.info(f"Score: {best_solution.score}")
 
@@ -1,3 +1,4 @@
+import functools
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import List
@@ -11,15 +12,44 @@ class PromptGeneratorContext:
     strategy_result: SearchResult
 
 
+@dataclass
+class Prompt:
+    """A prompt split into a stable prefix and a per-iteration suffix.
+
+    The static part holds content that is identical across iterations (the
+    problem description); keeping it first lets providers with prefix-based
+    prompt caching reuse it, cutting input-token cost and latency. The
+    dynamic part holds the parent solutions and task for this iteration.
+    """
+
+    static: str
+    dynamic: str
+
+    @property
+    def text(self) -> str:
+        return f"{self.static}\n\n{self.dynamic}"
+
+
+@functools.lru_cache(maxsize=4)
+def _problem_preamble(description: str) -> str:
+    """Rendered problem-description section, memoized per description.
+
+    The description never changes during a run, so re-formatting a
+    potentially long text every iteration is wasted work."""
+    return f"""# Problem description
+
+{description}"""
+
+
 class PromptGenerator(ABC):
     @abstractmethod
-    def generate(self, context: PromptGeneratorContext) -> str:
+    def generate(self, context: PromptGeneratorContext) -> Prompt:
         pass
 
 
 class DefaultPromptGenerator(PromptGenerator):
 
-    def generate(self, context: PromptGeneratorContext) -> str:
+    def generate(self, context: PromptGeneratorContext) -> Prompt:
         solutions_section_buffer: List[str] = []
 
         for solution_with_title in context.strategy_result.solutions:
@@ -52,11 +82,9 @@ class DefaultPromptGenerator(PromptGenerator):
 
         solutions_section = "\n".join(solutions_section_buffer)
 
-        text = f"""# Problem description
-
-{context.problem.description}
+        static = _problem_preamble(context.problem.description)
 
-# Solutions
+        dynamic = f"""# Solutions
 
 {solutions_section}
 
@@ -65,4 +93,4 @@ class DefaultPromptGenerator(PromptGenerator):
 {context.strategy_result.task}
 """
 
-        return text
+        return Prompt(static=static, dynamic=dynamic)
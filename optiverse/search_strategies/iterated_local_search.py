@@ -1,43 +1,21 @@
 from abc import ABC, abstractmethod
+import bisect
+import itertools
 import random
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from .models import SearchStrategy, SearchContext, SearchResult, SolutionWithTitle
-from ..store import Solution
+from ..store import Store
 
+# Parent titles are drawn from a fixed, tiny set; prebuilding them avoids
+# an f-string per selected parent in the per-iteration path
+_PARENT_TITLES = ("Solution 1", "Solution 2", "Solution 3")
 
-def get_initial_solution(solutions: List[Solution]) -> Solution:
-    for solution in solutions:
-        if solution.is_initial:
-            return solution
 
-    raise ValueError("No initial solution found.")
-
-
-def select_best_solutions_from_groups(
-    solutions: List[Solution],
-) -> List[SolutionWithTitle]:
-    valid_solutions = [s for s in solutions if s.score is not None]
-    if not valid_solutions:
-        return []
-
-    # Group solutions by their group tag
-    groups: Dict[Union[str, int], List[Solution]] = {}
-    for solution in valid_solutions:
-        group_id = solution.tags.get("group")
-        if group_id is None:
-            continue
-
-        if group_id not in groups:
-            groups[group_id] = []
-
-        groups[group_id].append(solution)
-
-    # Pick the best solution from each group (lowest score)
-    best_from_each_group: List[Solution] = []
-    for group_solutions in groups.values():
-        best_solution = min(group_solutions, key=lambda s: cast(float, s.score))
-        best_from_each_group.append(best_solution)
+def select_best_solutions_from_groups(store: Store) -> List[SolutionWithTitle]:
+    # The store keeps the best solution per group indexed incrementally,
+    # so no rescan of all solutions is needed here
+    best_from_each_group = list(store.get_best_solutions_by_group().values())
 
     # Randomly pick up to 3 solutions from these best solutions
     num_to_pick = min(3, len(best_from_each_group))
@@ -47,16 +25,14 @@ def select_best_solutions_from_groups(
     parents = random.sample(best_from_each_group, num_to_pick)
 
     return [
-        SolutionWithTitle(solution=s, title=f"Solution {i + 1}")
+        SolutionWithTitle(solution=s, title=_PARENT_TITLES[i])
         for i, s in enumerate(parents)
     ]
 
 
 class PerturbationMethod(ABC):
     @abstractmethod
-    def perturb(
-        self, solutions: List[Solution], tags: Dict[str, Union[int, str]]
-    ) -> SearchResult:
+    def perturb(self, store: Store, tags: Dict[str, Union[int, str]]) -> SearchResult:
         pass
 
 
@@ -75,16 +51,18 @@ def normalize_perturbation_weights(
     if total_weight <= 0:
         raise ValueError("Total weight must be positive")
 
+    # Already normalized (the default weights are) - skip the divisions
+    if abs(total_weight - 1.0) < 1e-9:
+        return dict(perturbation_methods)
+
     return {
         method: weight / total_weight for method, weight in perturbation_methods.items()
     }
 
 
 class InitialSolutionPerturbation(PerturbationMethod):
-    def perturb(
-        self, solutions: List[Solution], tags: Dict[str, Union[int, str]]
-    ) -> SearchResult:
-        initial_solution = get_initial_solution(solutions)
+    def perturb(self, store: Store, tags: Dict[str, Union[int, str]]) -> SearchResult:
+        initial_solution = store.get_initial_solution()
         result_tags = tags.copy()
         result_tags["move"] = "perturb_restart"
         return SearchResult(
@@ -98,13 +76,11 @@ Construct the solution from scratch based on the problem requirements, constrain
 
 
 class BestSolutionPerturbation(PerturbationMethod):
-    def perturb(
-        self, solutions: List[Solution], tags: Dict[str, Union[int, str]]
-    ) -> SearchResult:
-        selected_solutions = select_best_solutions_from_groups(solutions)
+    def perturb(self, store: Store, tags: Dict[str, Union[int, str]]) -> SearchResult:
+        selected_solutions = select_best_solutions_from_groups(store)
 
         if not selected_solutions:
-            return InitialSolutionPerturbation().perturb(solutions, tags)
+            return InitialSolutionPerturbation().perturb(store, tags)
 
         result_tags = tags.copy()
         result_tags["move"] = "perturb_exploit"
@@ -121,13 +97,11 @@ Ensure that the resulting solution is logically consistent, feasible, and repres
 
 
 class DiverseBestSolutionPerturbation(PerturbationMethod):
-    def perturb(
-        self, solutions: List[Solution], tags: Dict[str, Union[int, str]]
-    ) -> SearchResult:
-        selected_solutions = select_best_solutions_from_groups(solutions)
+    def perturb(self, store: Store, tags: Dict[str, Union[int, str]]) -> SearchResult:
+        selected_solutions = select_best_solutions_from_groups(store)
 
         if not selected_solutions:
-            return InitialSolutionPerturbation().perturb(solutions, tags)
+            return InitialSolutionPerturbation().perturb(store, tags)
 
         result_tags = tags.copy()
         result_tags["move"] = "perturb_explore"
@@ -169,24 +143,39 @@ class IteratedLocalSearch(SearchStrategy):
             perturbation_methods
         )
 
-    def _improve(self, solutions: List[Solution]) -> SearchResult:
-        solutions_in_current_group = [
-            s
-            for s in solutions
-            if s.score is not None and s.tags.get("group") == self._group
-        ]
+        # The weights never change after construction, so precompute the
+        # cumulative distribution once; _perturb then draws with a single
+        # bisect instead of random.choices rebuilding the cumulative sums
+        # on every call
+        self._methods = list(self._perturbation_methods.keys())
+        self._cum_weights = list(
+            itertools.accumulate(self._perturbation_methods.values())
+        )
+
+        # Memoized result of the last _improve() call, keyed on the store
+        # version and group. _improve() is deterministic for a given store
+        # state, so when nothing changed (e.g. the previous iteration
+        # failed to add a solution) the cached result can be reused
+        # without rescanning the store. _perturb() picks methods randomly
+        # and must never be memoized.
+        self._improve_cache: Optional[Tuple[Tuple[int, int], SearchResult]] = None
+
+    def _improve(self, store: Store) -> SearchResult:
+        cache_key = (store.version, self._group)
+        if self._improve_cache is not None and self._improve_cache[0] == cache_key:
+            return self._improve_cache[1]
+
+        # The store keeps scored solutions indexed per group, sorted best
+        # first, so no scan over all solutions is needed here
+        solutions_in_current_group = store.solutions_in_group(self._group)
 
         if not solutions_in_current_group:
-            return InitialSolutionPerturbation().perturb(
-                solutions, {"group": self._group}
-            )
+            return InitialSolutionPerturbation().perturb(store, {"group": self._group})
 
-        sorted_solutions = sorted(
-            solutions_in_current_group, key=lambda x: cast(float, x.score)
-        )
+        best_solution = solutions_in_current_group[0]
 
-        return SearchResult(
-            solutions=[SolutionWithTitle(solution=sorted_solutions[0], title="Parent")],
+        result = SearchResult(
+            solutions=[SolutionWithTitle(solution=best_solution, title="Parent")],
             tags={
                 "move": "local_search",
                 "group": self._group,
@@ -194,32 +183,39 @@ class IteratedLocalSearch(SearchStrategy):
             task="Apply focused local improvements to enhance the current solution quality",
         )
 
-    def _perturb(self, solutions: List[Solution]) -> SearchResult:
+        self._improve_cache = (cache_key, result)
+
+        return result
+
+    def _perturb(self, store: Store) -> SearchResult:
         self._best_score = float("inf")
         self._group += 1
         self._num_iterations_without_improvements = 0
 
-        # Select perturbation method using weighted random selection
-        methods = list(self._perturbation_methods.keys())
-        weights = list(self._perturbation_methods.values())
-
-        selected_method = random.choices(methods, weights=weights)[0]
+        # Select perturbation method using weighted random selection over
+        # the precomputed cumulative weights
+        selected_method = self._methods[
+            bisect.bisect(
+                self._cum_weights,
+                random.random() * self._cum_weights[-1],
+                0,
+                len(self._methods) - 1,
+            )
+        ]
 
         # Get the perturbation result
-        result = selected_method.perturb(solutions, {"group": self._group})
+        result = selected_method.perturb(store, {"group": self._group})
 
         return result
 
     def apply(self, context: SearchContext) -> SearchResult:
-        solutions = context.store.get_all_solutions()
-
         if (
             self._num_iterations_without_improvements
             < self._max_iterations_without_improvements
         ):
-            return self._improve(solutions)
+            return self._improve(context.store)
 
-        return self._perturb(solutions)
+        return self._perturb(context.store)
 
     def result(self, iteration: int, score: Optional[float]) -> None:
         if score is not None and score < self._best_score:
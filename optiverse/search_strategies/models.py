@@ -4,19 +4,19 @@ from typing import Any, Dict, List, Optional, Union
 from ..store import Solution, Store
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchContext:
     iteration: int
     store: Store
 
 
-@dataclass
+@dataclass(slots=True)
 class SolutionWithTitle:
     solution: Solution
     title: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     solutions: List[SolutionWithTitle]
     tags: Dict[str, Union[int, str]]
@@ -1,12 +1,37 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
+import bisect
+import os
 import uuid
 import json
 import shutil
 import csv
-from typing import List, Dict, Optional, Set, Union, cast
+from typing import Any, List, Dict, Optional, Set, Union, cast
 from dataclasses import dataclass
 
+try:
+    import orjson
+
+    def _dump_json(obj: Any, path: Path) -> None:
+        path.write_bytes(
+            orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+
+    def _load_json(path: Path) -> Any:
+        return orjson.loads(path.read_bytes())
+
+except ImportError:
+    # orjson is optional; fall back to the standard library encoder
+    def _dump_json(obj: Any, path: Path) -> None:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+    def _load_json(path: Path) -> Any:
+        with open(path, "r") as f:
+            return json.load(f)
+
 
 @dataclass
 class Solution:
@@ -19,6 +44,11 @@ class Solution:
     tags: Dict[str, Union[int, str]]
 
 
+# C-implemented sort/insort key for solutions whose score is known to be
+# set; avoids a Python lambda frame per comparison
+_SCORE_KEY = attrgetter("score")
+
+
 class Store(ABC):
     @abstractmethod
     def add_solution(
@@ -42,24 +72,138 @@ class Store(ABC):
     def get_all_solutions(self) -> List[Solution]:
         pass
 
+    @abstractmethod
+    def get_best_solutions_by_group(self) -> Dict[Union[int, str], Solution]:
+        pass
+
+    @abstractmethod
+    def solutions_in_group(self, group: Union[int, str]) -> List[Solution]:
+        """Scored solutions in a group, sorted by score (best first)."""
+        pass
+
+    @abstractmethod
+    def get_initial_solution(self) -> Solution:
+        pass
+
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """Counter that increments whenever the stored solutions change.
+
+        Callers can compare versions to detect that nothing changed and
+        reuse previously computed results."""
+        ...
+
 
 class FileSystemStore(Store):
     def __init__(self, directory: Path):
         self._directory = directory
 
+        # In-memory copy of all solutions, loaded from disk once and then
+        # mutated incrementally, so get_all_solutions (called every
+        # iteration, and by _write_solutions_csv on every add) does not
+        # re-read the whole store from disk
+        self._solutions: Optional[Dict[str, Solution]] = None
+
+        # Best-scored solution per group tag, built lazily from disk and
+        # then kept up to date incrementally as solutions are added, so
+        # strategies get best-of-group lookups without rescanning the store
+        self._best_by_group: Optional[Dict[Union[int, str], Solution]] = None
+
+        # Scored solutions per group tag, each list kept sorted by score
+        # (best first) via bisect.insort, so group lookups avoid scanning
+        # and re-filtering the whole store
+        self._scored_by_group: Optional[Dict[Union[int, str], List[Solution]]] = None
+
+        # CSV row order (scored solutions sorted best first, then failed
+        # ones), maintained incrementally so each add_solution does an
+        # O(log N) insertion instead of re-sorting every solution before
+        # the rewrite
+        self._csv_scored: Optional[List[Solution]] = None
+        self._csv_failed: Optional[List[Solution]] = None
+
+        # The initial solution never changes once added; cache it so
+        # restart perturbations don't scan all solutions to find it
+        self._initial_solution: Optional[Solution] = None
+
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @staticmethod
+    def _consider_for_group_index(
+        index: Dict[Union[int, str], Solution], solution: Solution
+    ) -> None:
+        if solution.score is None:
+            return
+
+        group = solution.tags.get("group")
+        if group is None:
+            return
+
+        best = index.get(group)
+        if best is None or cast(float, best.score) > solution.score:
+            index[group] = solution
+
+    @staticmethod
+    def _insert_into_scored_index(
+        index: Dict[Union[int, str], List[Solution]], solution: Solution
+    ) -> None:
+        if solution.score is None:
+            return
+
+        group = solution.tags.get("group")
+        if group is None:
+            return
+
+        bisect.insort(index.setdefault(group, []), solution, key=_SCORE_KEY)
+
+    def solutions_in_group(self, group: Union[int, str]) -> List[Solution]:
+        if self._scored_by_group is None:
+            index: Dict[Union[int, str], List[Solution]] = {}
+            for solution in self.get_all_solutions():
+                self._insert_into_scored_index(index, solution)
+            self._scored_by_group = index
+
+        return list(self._scored_by_group.get(group, []))
+
+    def get_initial_solution(self) -> Solution:
+        if self._initial_solution is None:
+            for solution in self.get_all_solutions():
+                if solution.is_initial:
+                    self._initial_solution = solution
+                    break
+            else:
+                raise ValueError("No initial solution found.")
+
+        return self._initial_solution
+
+    def get_best_solutions_by_group(self) -> Dict[Union[int, str], Solution]:
+        if self._best_by_group is None:
+            index: Dict[Union[int, str], Solution] = {}
+            for solution in self.get_all_solutions():
+                self._consider_for_group_index(index, solution)
+            self._best_by_group = index
+
+        return dict(self._best_by_group)
+
+    def _ensure_csv_order(self) -> None:
+        if self._csv_scored is None or self._csv_failed is None:
+            solutions = self.get_all_solutions()
+            self._csv_scored = sorted(
+                (s for s in solutions if s.score is not None), key=_SCORE_KEY
+            )
+            self._csv_failed = [s for s in solutions if s.score is None]
+
     def _write_solutions_csv(self) -> None:
         """Write all solutions to solutions.csv file sorted by score (best first)."""
-        solutions = self.get_all_solutions()
-
-        # Separate valid solutions from failed solutions
-        valid_solutions = [s for s in solutions if s.score is not None]
-        failed_solutions = [s for s in solutions if s.score is None]
+        self._ensure_csv_order()
+        assert self._csv_scored is not None and self._csv_failed is not None
 
-        # Sort valid solutions by score (best first)
-        sorted_valid = sorted(valid_solutions, key=lambda x: cast(float, x.score))
-
-        # Combine: valid solutions first, then failed solutions
-        all_sorted = sorted_valid + failed_solutions
+        # Valid solutions first (already sorted best first), then failed ones
+        all_sorted = self._csv_scored + self._csv_failed
 
         # Collect all unique tag and metric names and sort them alphabetically
         all_tag_names: Set[str] = set()
@@ -70,8 +214,12 @@ class FileSystemStore(Store):
         sorted_tag_names = sorted(all_tag_names)
         sorted_metric_names = sorted(all_metric_names)
 
+        # Write to a temporary file and rename it into place, so readers
+        # never see a partially written CSV and a crash mid-write cannot
+        # corrupt the previous one
         csv_path = self._directory / "solutions.csv"
-        with open(csv_path, "w", newline="") as csvfile:
+        tmp_path = self._directory / "solutions.csv.tmp"
+        with open(tmp_path, "w", newline="") as csvfile:
             writer = csv.writer(csvfile)
             # Create dynamic headers with t_{tag_name} and m_{metric_name} format
             tag_headers = [f"t_{tag_name}" for tag_name in sorted_tag_names]
@@ -93,6 +241,8 @@ class FileSystemStore(Store):
                     [solution.id, score_display] + tag_values + metric_values
                 )
 
+        os.replace(tmp_path, csv_path)
+
     def add_solution(
         self,
         artifacts: Dict[str, str],
@@ -139,8 +289,34 @@ class FileSystemStore(Store):
             "tags": tags,
         }
         meta_file = solution_dir / "metadata.json"
-        with open(meta_file, "w") as f:
-            json.dump(meta, f, indent=2)
+        _dump_json(meta, meta_file)
+
+        solution = Solution(
+            code=code,
+            description=description,
+            id=id,
+            is_initial=is_initial,
+            metrics=metrics,
+            score=score,
+            tags=tags,
+        )
+
+        self._ensure_solutions_loaded()[id] = solution
+
+        if is_initial and self._initial_solution is None:
+            self._initial_solution = solution
+
+        if self._best_by_group is not None:
+            self._consider_for_group_index(self._best_by_group, solution)
+        if self._scored_by_group is not None:
+            self._insert_into_scored_index(self._scored_by_group, solution)
+        if self._csv_scored is not None and self._csv_failed is not None:
+            if score is None:
+                self._csv_failed.append(solution)
+            else:
+                bisect.insort(self._csv_scored, solution, key=_SCORE_KEY)
+
+        self._version += 1
 
         self._write_solutions_csv()
 
@@ -152,46 +328,86 @@ class FileSystemStore(Store):
             return False
 
         shutil.rmtree(solution_dir)
+
+        if self._solutions is not None:
+            self._solutions.pop(solution_id, None)
+
+        if (
+            self._initial_solution is not None
+            and self._initial_solution.id == solution_id
+        ):
+            self._initial_solution = None
+
+        # The removed solution may still be indexed; rebuild lazily
+        self._best_by_group = None
+        self._scored_by_group = None
+        self._csv_scored = None
+        self._csv_failed = None
+
+        self._version += 1
+
         self._write_solutions_csv()
 
         return True
 
-    def get_all_solutions(self) -> List[Solution]:
-        solutions: List[Solution] = []
+    def _load_solutions_from_disk(self) -> Dict[str, Solution]:
+        solutions: Dict[str, Solution] = {}
 
         if not self._directory.exists():
             return solutions
 
-        # Load all solutions from disk
-        for solution_dir in self._directory.iterdir():
-            if solution_dir.is_dir():
-                meta_file = solution_dir / "metadata.json"
-                solution_file = solution_dir / "solution.txt"
-
-                # Load metadata
-                with open(meta_file, "r") as f:
-                    meta = json.load(f)
-
-                # Load solution code
-                with open(solution_file, "r") as f:
-                    file_content = f.read()
-
-                # Load description if exists
-                description_path = solution_dir / "description.txt"
-                description = None
-                if description_path.exists():
-                    with open(description_path, "r") as f:
-                        description = f.read()
-
-                solution = Solution(
-                    code=file_content,
-                    description=description,
-                    id=meta["id"],
-                    is_initial=meta["is_initial"],
-                    metrics=meta["metrics"],
-                    score=meta["score"],
-                    tags=meta["tags"],
-                )
-                solutions.append(solution)
+        # os.scandir returns directory entries with cached type info, so
+        # each entry costs one syscall rather than a stat per path
+        with os.scandir(self._directory) as entries:
+            solution_dirs = [
+                Path(entry.path)
+                for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+            ]
+
+        if not solution_dirs:
+            return solutions
+
+        # The load is I/O-bound (several file reads per solution) and the
+        # GIL is released during reads, so threads overlap the syscall
+        # latency across directories
+        max_workers = min(32, 4 * (os.cpu_count() or 1), len(solution_dirs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for solution in executor.map(self._load_one_solution, solution_dirs):
+                solutions[solution.id] = solution
 
         return solutions
+
+    @staticmethod
+    def _load_one_solution(solution_dir: Path) -> Solution:
+        # Load metadata
+        meta = _load_json(solution_dir / "metadata.json")
+
+        # Load solution code
+        file_content = (solution_dir / "solution.txt").read_text()
+
+        # Load description if exists; opening directly avoids a separate
+        # exists() stat
+        try:
+            description: Optional[str] = (solution_dir / "description.txt").read_text()
+        except FileNotFoundError:
+            description = None
+
+        return Solution(
+            code=file_content,
+            description=description,
+            id=meta["id"],
+            is_initial=meta["is_initial"],
+            metrics=meta["metrics"],
+            score=meta["score"],
+            tags=meta["tags"],
+        )
+
+    def _ensure_solutions_loaded(self) -> Dict[str, Solution]:
+        if self._solutions is None:
+            self._solutions = self._load_solutions_from_disk()
+
+        return self._solutions
+
+    def get_all_solutions(self) -> List[Solution]:
+        return list(self._ensure_solutions_loaded().values())